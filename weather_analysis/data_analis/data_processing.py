@@ -1,6 +1,246 @@
+from functools import cached_property, lru_cache, partial
+
 import pandas as pd
 import numpy as np
-from .utils import cache_decorator
+import xlsxwriter
+from numba import njit, prange
+
+try:
+    import bottleneck as bn
+except ImportError:
+    bn = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:
+    pa = None
+    pc = None
+
+
+# Флаги fastmath без nnan/ninf: ядра записывают NaN в выходные массивы.
+_FASTMATH = {'nsz', 'arcp', 'contract', 'afn', 'reassoc'}
+
+
+@njit(fastmath=_FASTMATH, cache=True)
+def _acf_lag(X, lag):
+    """
+    Вычисляет автокорреляцию (корреляцию Пирсона ряда с его сдвигом) для одного лага,
+    как pd.Series.autocorr: пары, в которых есть пропуск (NaN), не учитываются.
+
+    Все суммы накапливаются в float64 за один проход по ряду, без промежуточных срезов.
+
+    Параметры:
+    - X (np.ndarray): Одномерный массив значений ряда.
+    - lag (int): Лаг от 0 до длины ряда - 1.
+
+    Возвращает:
+    - float: Значение автокорреляции; NaN, если пар меньше двух или дисперсия равна нулю.
+    """
+    n = X.shape[0]
+    m = 0
+    s1 = 0.0
+    s2 = 0.0
+    ss1 = 0.0
+    ss2 = 0.0
+    s12 = 0.0
+    for i in range(n - lag):
+        a = np.float64(X[i])
+        b = np.float64(X[i + lag])
+        if np.isnan(a) or np.isnan(b):
+            continue
+        m += 1
+        s1 += a
+        s2 += b
+        ss1 += a * a
+        ss2 += b * b
+        s12 += a * b
+    if m < 2:
+        return np.nan
+    v1 = ss1 - s1 * s1 / m
+    v2 = ss2 - s2 * s2 / m
+    if v1 <= 0.0 or v2 <= 0.0:
+        return np.nan
+    return (s12 - s1 * s2 / m) / np.sqrt(v1 * v2)
+
+
+@njit(parallel=True, fastmath=_FASTMATH, cache=True)
+def _acf_kernel_par(X, max_lag, out):
+    """
+    Вычисляет автокорреляцию _acf_lag для лагов от 0 до max_lag.
+
+    Лаги независимы и распределяются по потокам через prange; каждый поток пишет только свою ячейку out.
+
+    Параметры:
+    - X (np.ndarray): Одномерный массив значений ряда.
+    - max_lag (int): Максимальный лаг.
+    - out (np.ndarray): Выходной массив длиной не меньше max_lag + 1, в который записываются
+      значения автокорреляции для лагов от 0 до max_lag.
+    """
+    for lag in prange(max_lag + 1):
+        out[lag] = _acf_lag(X, lag)
+
+
+@njit(cache=True)
+def _rolling_mean(x, w):
+    """
+    Вычисляет скользящее среднее с окном w через накопленную сумму: O(1) на каждый элемент.
+
+    Вместе с суммой хранится число известных значений в окне, поэтому пропуск (NaN) даёт NaN
+    только для окон, в которые он попадает, как rolling(w).mean() в pandas.
+
+    Параметры:
+    - x (np.ndarray): Одномерный массив значений ряда.
+    - w (int): Размер окна.
+
+    Возвращает:
+    - np.ndarray: Скользящее среднее; первые w - 1 позиций и окна с пропусками заполнены NaN.
+    """
+    n = x.shape[0]
+    out = np.full(n, np.nan)
+    if w < 1 or w > n:
+        return out
+    s = 0.0
+    count = 0
+    for i in range(n):
+        if not np.isnan(x[i]):
+            s += x[i]
+            count += 1
+        if i >= w and not np.isnan(x[i - w]):
+            s -= x[i - w]
+            count -= 1
+        if i >= w - 1 and count == w:
+            out[i] = s / w
+    return out
+
+
+@njit(cache=True)
+def _rolling_max(x, w):
+    """
+    Вычисляет скользящий максимум с окном w за O(N) при любом размере окна.
+
+    Используется монотонная очередь индексов в кольцевом буфере длины w: значения в очереди
+    убывают, поэтому максимум окна всегда находится в её начале. Пропуски (NaN) в очередь не
+    попадают, а считаются отдельно, как в _rolling_mean: окно с пропуском даёт NaN,
+    как rolling(w).max() в pandas.
+
+    Параметры:
+    - x (np.ndarray): Одномерный массив значений ряда.
+    - w (int): Размер окна.
+
+    Возвращает:
+    - np.ndarray: Скользящий максимум; первые w - 1 позиций и окна с пропусками заполнены NaN.
+    """
+    n = x.shape[0]
+    out = np.full(n, np.nan)
+    if w < 1 or w > n:
+        return out
+    idx = np.empty(w, dtype=np.int64)
+    head = 0
+    size = 0
+    nan_count = 0
+    for i in range(n):
+        if i >= w and np.isnan(x[i - w]):
+            nan_count -= 1
+        if size > 0 and idx[head] <= i - w:
+            head = (head + 1) % w
+            size -= 1
+        if np.isnan(x[i]):
+            nan_count += 1
+        else:
+            while size > 0 and x[idx[(head + size - 1) % w]] <= x[i]:
+                size -= 1
+            idx[(head + size) % w] = i
+            size += 1
+        if i >= w - 1 and nan_count == 0:
+            out[i] = x[idx[head]]
+    return out
+
+
+@njit(cache=True)
+def _rolling_min(x, w):
+    """
+    Вычисляет скользящий минимум с окном w как скользящий максимум ряда с обратным знаком.
+    """
+    return -_rolling_max(-x, w)
+
+
+# Размер блока, который обрабатывается одним потоком в _process_kernel.
+_CHUNK = 1 << 14
+
+
+@njit(parallel=True, fastmath=_FASTMATH, cache=True)
+def _process_kernel(x, w, ma_out, diff_out, max_mask, min_mask):
+    """
+    Вычисляет скользящее среднее, первую разность и маски экстремумов за один проход по ряду.
+
+    Ряд делится на блоки, которые обрабатываются параллельно; каждый блок начинает накопленную
+    сумму скользящего среднего с w предшествующих элементов. Как и в _rolling_mean, вместе с суммой
+    хранится число известных значений в окне, поэтому пропуск (NaN) влияет только на окна, в которые
+    он попадает, и результат не зависит от разбиения на блоки.
+
+    Параметры:
+    - x (np.ndarray): Одномерный массив значений ряда.
+    - w (int): Размер окна скользящего среднего.
+    - ma_out (np.ndarray): Выходной массив скользящего среднего.
+    - diff_out (np.ndarray): Выходной массив первой разности.
+    - max_mask (np.ndarray): Выходная маска (uint8, 1/0) локальных максимумов.
+    - min_mask (np.ndarray): Выходная маска (uint8, 1/0) локальных минимумов.
+    """
+    n = x.shape[0]
+    n_chunks = (n + _CHUNK - 1) // _CHUNK
+    for c in prange(n_chunks):
+        start = c * _CHUNK
+        stop = min(start + _CHUNK, n)
+        s = 0.0
+        count = 0
+        for j in range(max(start - w, 0), start):
+            if not np.isnan(x[j]):
+                s += x[j]
+                count += 1
+        for i in range(start, stop):
+            if not np.isnan(x[i]):
+                s += x[i]
+                count += 1
+            if i >= w and not np.isnan(x[i - w]):
+                s -= x[i - w]
+                count -= 1
+            ma_out[i] = s / w if i >= w - 1 and count == w else np.nan
+            diff_out[i] = x[i] - x[i - 1] if i > 0 else np.nan
+            if 0 < i < n - 1:
+                max_mask[i] = 1 if x[i - 1] < x[i] and x[i + 1] < x[i] else 0
+                min_mask[i] = 1 if x[i - 1] > x[i] and x[i + 1] > x[i] else 0
+            else:
+                max_mask[i] = 0
+                min_mask[i] = 0
+
+
+def _moving_average(x: np.ndarray, index: pd.Index, window: int) -> pd.Series:
+    """
+    Вычисляет скользящее среднее без кэширования; кэш создаётся для каждого экземпляра в __init__.
+
+    Функция не получает сам обработчик, поэтому кэш не образует ссылочного цикла с экземпляром
+    и освобождается вместе с ним, не дожидаясь циклического сборщика мусора. Ряд приводится к float64,
+    чтобы тип и точность результата не зависели от того, установлен ли bottleneck.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    if bn is not None and 1 <= window <= x.size:
+        out = bn.move_mean(x, window=window, min_count=window)
+    else:
+        out = _rolling_mean(x, window)
+    return pd.Series(out, index=index)
+
+
+def _autocorrelation(x: np.ndarray, lag: int) -> float:
+    """
+    Вычисляет автокорреляцию для заданного лага без кэширования; кэш создаётся для каждого экземпляра.
+
+    Как и _moving_average, функция не получает сам обработчик, поэтому кэш не образует ссылочного цикла.
+    """
+    if not 0 <= lag < x.size:
+        return np.nan
+    return float(_acf_lag(x, lag))
+
 
 class WeatherDataProcessor:
     """
@@ -12,24 +252,79 @@ class WeatherDataProcessor:
     - autocorrelation: Вычисление автокорреляции температурного ряда.
     - find_extremes: Определение локальных максимумов и минимумов температур.
     - process_data: Интеграция всех метрик в один DataFrame.
+    - rolling_extremes: Вычисление скользящих максимумов и минимумов температур.
+    - extrema_values: Значения температур в точках, отмеченных флагами экстремумов.
 
 Атрибуты:
-        data (pd.DataFrame): Исходный DataFrame с погодными данными.
+        data (pd.DataFrame): Копия исходного DataFrame с погодными данными, снятая при создании обработчика.
 
     Методы:
         process_data() -> pd.DataFrame:
             Обрабатывает данные и возвращает результат.
     """
-    def __init__(self, data: pd.DataFrame):
+    def __init__(self, data: pd.DataFrame, use_arrow: bool = False):
         """
         Инициализирует обработчик данных погоды.
 
         Параметры:
         - data (pd.DataFrame): Входные данные с индексом в виде дат и столбцом 'temperature'.
+        - use_arrow (bool): Хранить столбец 'temperature' в типе 'float64[pyarrow]' и вычислять
+          разности ядрами pyarrow.compute в той же точности float64, что и без него, поэтому
+          результаты не меняются. Требует pandas >= 2 и pyarrow; на pandas 1.x игнорируется.
         """
+        self._use_arrow = use_arrow and int(pd.__version__.split('.')[0]) >= 2
+        # Снимок данных: изменения исходного DataFrame после создания обработчика не должны расходиться
+        # с отпечатком для __hash__ и с закэшированными результатами.
+        if self._use_arrow:
+            data = data.astype({'temperature': 'float64[pyarrow]'})
+        else:
+            data = data.copy()
         self.data = data
+        self._temp = np.ascontiguousarray(self.data['temperature'].to_numpy(dtype=np.float64, na_value=np.nan))
+        self._index = data.index
+        x = self._temp
+        # Краткий отпечаток содержимого для __hash__ по исходным значениям в float64 (не по копии float32,
+        # в которой разные ряды могут совпасть); NaN заменяются нулями, чтобы хеш был детерминированным.
+        edges = np.nan_to_num(np.array([x[0], x[-1], np.nansum(x, dtype=np.float64)])) if x.size else ()
+        self._fingerprint = (x.size, *map(float, edges))
+        self._moving_average_cached = lru_cache(maxsize=32)(partial(_moving_average, self._temp, self._index))
+
+    def __hash__(self) -> int:
+        """
+        Вычисляет хеш обработчика по краткому отпечатку содержимого.
+
+        Возвращает:
+        - int: Хеш, одинаковый для обработчиков с равными данными.
+        """
+        return hash(self._fingerprint)
+
+    def __eq__(self, other) -> bool:
+        """
+        Сравнивает обработчики по содержимому: совпадают индекс и значения температур в float64.
+        """
+        if self is other:
+            return True
+        if not isinstance(other, WeatherDataProcessor):
+            return NotImplemented
+        return (
+            self._fingerprint == other._fingerprint
+            and self._index.equals(other._index)
+            and np.array_equal(self._temp, other._temp, equal_nan=True)
+        )
+
+    @cached_property
+    def _temp32(self) -> np.ndarray:
+        """
+        Создаёт копию температур в float32 для ядра автокорреляции при первом обращении.
+
+        Ядро возвращает коэффициенты, а не значения температур, и вдвое меньший объём данных
+        ускоряет его O(N * max_lag) проходов; суммы в нём накапливаются в float64.
+
+        Возвращает:
+        - np.ndarray: Температуры в float32.
+        """
+        return self._temp.astype(np.float32)
 
-    @cache_decorator
     def moving_average(self, window: int) -> pd.Series:
         """
         Вычисляет скользящее среднее для столбца 'temperature'.
@@ -40,9 +335,28 @@ class WeatherDataProcessor:
         Возвращает:
         - pd.Series: Скользящее среднее температур в заданном окне.
         """
-        return self.data['temperature'].rolling(window=window).mean()
+        return self._moving_average_cached(window)
+
+    def rolling_extremes(self, window: int) -> (pd.Series, pd.Series):
+        """
+        Вычисляет скользящие максимум и минимум для столбца 'temperature'.
+
+        Параметры:
+        - window (int): Размер окна.
+
+        Возвращает:
+        - tuple of pd.Series: (rolling_max, rolling_min) со значениями NaN в первых window - 1 позициях
+          и в окнах с пропусками.
+
+        Исключения:
+        - ValueError: Если window отрицательно.
+        """
+        if window < 0:
+            raise ValueError("window must be an integer 0 or greater")
+        rolling_max = pd.Series(_rolling_max(self._temp, window), index=self._index)
+        rolling_min = pd.Series(_rolling_min(self._temp, window), index=self._index)
+        return rolling_max, rolling_min
 
-    @cache_decorator
     def differential(self) -> pd.Series:
         """
         Вычисляет первую разность температурного ряда (дифференциал).
@@ -50,22 +364,82 @@ class WeatherDataProcessor:
         Возвращает:
         - pd.Series: Разности между последовательными температурами.
         """
-        return self.data['temperature'].diff()
+        return self._differential
+
+    @cached_property
+    def _differential(self) -> pd.Series:
+        """
+        Вычисляет первую разность один раз для экземпляра.
+
+        Возвращает:
+        - pd.Series: Разности между последовательными температурами; первое значение NaN.
+        """
+        x = self._temp
+        out = np.empty(x.size)
+        if x.size:
+            out[0] = np.nan
+            if self._use_arrow:
+                arr = pa.array(self.data['temperature'].array)
+                out[1:] = np.asarray(pc.subtract(arr.slice(1), arr.slice(0, len(arr) - 1)), dtype=np.float64)
+            else:
+                np.subtract(x[1:], x[:-1], out=out[1:])
+        return pd.Series(out, index=self._index)
 
-    @cache_decorator
     def autocorrelation(self, lag: int) -> float:
         """
         Вычисляет значение автокорреляции для заданного лага.
 
+        Автокорреляция определяется как в pd.Series.autocorr и autocorrelation_generator:
+        корреляция Пирсона ряда с его сдвигом на lag, без учёта пар с пропусками.
+
         Параметры:
         - lag (int): Задержка, для которой рассчитывается автокорреляция.
 
         Возвращает:
-        - float: Значение автокорреляции.
+        - float: Значение автокорреляции; NaN, если лаг вне диапазона от 0 до длины ряда - 1.
+        """
+        return self._autocorrelation_cached(lag)
+
+    @cached_property
+    def _autocorrelation_cached(self):
+        """
+        Создаёт кэш автокорреляции по лагам для экземпляра при первом обращении.
+
+        Возвращает:
+        - Callable: Обёрнутая lru_cache функция _autocorrelation для температур этого обработчика.
+        """
+        return lru_cache(maxsize=32)(partial(_autocorrelation, self._temp32))
+
+    @cached_property
+    def _acf_fft(self) -> np.ndarray:
+        """
+        Вычисляет автокорреляцию для всех лагов сразу через БПФ за O(N log N).
+
+        В отличие от autocorrelation(lag), это классическая выборочная АКФ: ряд центрируется
+        по общему среднему, а ковариация на каждом лаге делится на дисперсию (значение на лаге 0).
+
+        Пропуски (NaN) не учитываются: ряд центрируется по среднему известных значений,
+        а пропуски заменяются нулём, то есть не вносят вклада в суммы произведений.
+
+        Возвращает:
+        - np.ndarray: Нормированная автокорреляционная функция для лагов от 0 до длины ряда - 1;
+          NaN целиком, если в ряду нет известных значений или он постоянен.
         """
-        return self.data['temperature'].autocorr(lag=lag)
+        x = self._temp.copy()
+        n = x.size
+        if n == 0:
+            return np.empty(0)
+        missing = np.isnan(x)
+        if missing.all():
+            return np.full(n, np.nan)
+        x -= np.nanmean(x)
+        x[missing] = 0.0
+        f = np.fft.rfft(x, n=2 * n)
+        acf = np.fft.irfft(f * np.conj(f), n=2 * n)[:n]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            acf /= acf[0]
+        return acf
 
-    @cache_decorator
     def find_extremes(self) -> (pd.Series, pd.Series):
         """
         Находит локальные максимумы и минимумы в ряду температур.
@@ -75,24 +449,51 @@ class WeatherDataProcessor:
           - maxima: Серия с локальными максимумами температур.
           - minima: Серия с локальными минимумами температур.
         """
-        maxima = self.data['temperature'][(self.data['temperature'].shift(1) < self.data['temperature']) & 
-                                          (self.data['temperature'].shift(-1) < self.data['temperature'])]
-        minima = self.data['temperature'][(self.data['temperature'].shift(1) > self.data['temperature']) & 
-                                          (self.data['temperature'].shift(-1) > self.data['temperature'])]
-        return maxima, minima
+        return self._extremes
+
+    @cached_property
+    def _extremes(self) -> (pd.Series, pd.Series):
+        """
+        Находит локальные экстремумы один раз для экземпляра по знакам соседних разностей.
+
+        Возвращает:
+        - tuple of pd.Series: (maxima, minima) со значениями температур в точках экстремумов.
+        """
+        x = self._temp
+        d = np.diff(x)
+        peaks = np.zeros(x.size, dtype=bool)
+        valleys = np.zeros(x.size, dtype=bool)
+        rising = d > 0
+        falling = d < 0
+        np.logical_and(rising[:-1], falling[1:], out=peaks[1:-1])
+        np.logical_and(falling[:-1], rising[1:], out=valleys[1:-1])
+        temperature = self.data['temperature']
+        return temperature[peaks], temperature[valleys]
 
-    def autocorrelation_generator(self):
+    def autocorrelation_generator(self, max_lag: int = None):
         """
-        Генератор, вычисляющий автокорреляцию для всех возможных лагов от 0 до длины ряда - 1.
+        Генератор, выдающий автокорреляцию для всех лагов от 0 до длины ряда - 1.
+
+        Значения вычисляются только до max_lag; для больших лагов выборочная автокорреляция
+        определяется в основном шумом, поэтому вместо них выдаётся NaN.
+
+        Параметры:
+        - max_lag (int): Максимальный вычисляемый лаг. По умолчанию min(n - 1, 10 * log10(n))
+          по правилу Бокса-Дженкинса.
 
         Генерирует:
         - float: значение автокорреляции поочерёдно для каждого лага.
         """
-        n = len(self.data)
-        for lag in range(n):
-            yield self.autocorrelation(lag)
+        n = self._temp.size
+        if n == 0:
+            return
+        if max_lag is None:
+            max_lag = int(10 * np.log10(max(n, 10)))
+        max_lag = min(max_lag, n - 1)
+        out = np.full(n, np.nan)
+        _acf_kernel_par(self._temp32, max_lag, out)
+        yield from out
 
-    @cache_decorator
     def process_data(self) -> pd.DataFrame:
         """
         Обрабатывает исходные погодные данные, интегрируя основные метрики в один DataFrame.
@@ -100,21 +501,61 @@ class WeatherDataProcessor:
         В процессе обработки данные дополняются следующими столбцами:
         - 'moving_average': Скользящее среднее температур с окном в 7 дней.
         - 'differential': Первая разность (дифференциал) температур.
-        - 'autocorrelation': Значения автокорреляции для всех лагов от 0 до длины ряда - 1.
-        - 'maxima': Локальные максимумы температур.
-        - 'minima': Локальные минимумы температур.
+        - 'autocorrelation': Значения выборочной автокорреляционной функции (через БПФ, с общим
+          средним ряда) для всех лагов от 0 до длины ряда - 1. Они могут отличаться от
+          autocorrelation(lag), где для каждого лага считается корреляция Пирсона.
+        - 'maxima': Флаг (uint8, 1/0) локального максимума температуры.
+        - 'minima': Флаг (uint8, 1/0) локального минимума температуры.
+
+        Возвращает:
+        - pd.DataFrame: DataFrame с исходными и вычисленными данными.
+        """
+        return self._processed
+
+    @cached_property
+    def _processed(self) -> pd.DataFrame:
+        """
+        Строит результат process_data один раз для экземпляра.
 
         Возвращает:
         - pd.DataFrame: DataFrame с исходными и вычисленными данными.
         """
-        result = pd.DataFrame(index=self.data.index)
-        result['temperature'] = self.data['temperature']
-        result['moving_average'] = self.moving_average(window=7)
-        result['differential'] = self.differential()
-        result['autocorrelation'] = list(self.autocorrelation_generator())
-        result['maxima'], result['minima'] = self.find_extremes()
+        x = self._temp
+        n = x.size
+        # Столбцовый (Fortran) порядок: каждый столбец результата лежит в памяти непрерывно.
+        arr = np.empty((n, 4), order='F')
+        max_mask = np.empty(n, dtype=np.uint8)
+        min_mask = np.empty(n, dtype=np.uint8)
+        arr[:, 0] = x
+        _process_kernel(x, 7, arr[:, 1], arr[:, 2], max_mask, min_mask)
+        arr[:, 3] = self._acf_fft
+        result = pd.DataFrame(
+            arr,
+            columns=['temperature', 'moving_average', 'differential', 'autocorrelation'],
+            index=self._index,
+        )
+        result['maxima'] = pd.Series(max_mask, index=self._index, dtype='uint8')
+        result['minima'] = pd.Series(min_mask, index=self._index, dtype='uint8')
         return result
 
+    def extrema_values(self) -> (pd.Series, pd.Series):
+        """
+        Возвращает значения температур в точках, отмеченных флагами 'maxima' и 'minima' в process_data.
+
+        Возвращает:
+        - tuple of pd.Series: (maxima, minima) где:
+          - maxima: Серия с локальными максимумами температур.
+          - minima: Серия с локальными минимумами температур.
+        """
+        result = self.process_data()
+        temperature = result['temperature']
+        return temperature[result['maxima'] == 1], temperature[result['minima'] == 1]
+
+# Предельный размер листа Excel (.xlsx): строки и столбцы.
+_EXCEL_MAX_ROWS = 1048576
+_EXCEL_MAX_COLS = 16384
+
+
 def save_to_excel(df: pd.DataFrame, filename: str):
     """
     Сохраняет DataFrame в Excel файл.
@@ -122,5 +563,36 @@ def save_to_excel(df: pd.DataFrame, filename: str):
     Параметры:
     - df (pd.DataFrame): DataFrame, который нужно сохранить.
     - filename (str): Путь и имя файла, в который будет сохранён DataFrame.
+
+    Файл записывается построчно движком xlsxwriter в режиме constant_memory, поэтому
+    объём используемой памяти не зависит от числа строк. Пропущенные значения оставляются пустыми ячейками.
+    Каждый уровень MultiIndex строк записывается в отдельный столбец, а уровни MultiIndex столбцов
+    объединяются в одно имя через '_'.
+
+    Исключения:
+    - ValueError: Если строки (вместе с заголовком) или столбцы (вместе с индексом) не помещаются на лист Excel.
     """
-    df.to_excel(filename)
\ No newline at end of file
+    index_names = ['' if name is None else str(name) for name in df.index.names]
+    if df.columns.nlevels > 1:
+        columns = ['_'.join(str(level) for level in column) for column in df.columns]
+    else:
+        columns = [str(column) for column in df.columns]
+    multi_index = df.index.nlevels > 1
+
+    n_rows = len(df) + 1
+    n_cols = len(index_names) + len(columns)
+    if n_rows > _EXCEL_MAX_ROWS or n_cols > _EXCEL_MAX_COLS:
+        raise ValueError(
+            f"This sheet is too large! Your sheet size is: {n_rows}, {n_cols} "
+            f"Max sheet size is: {_EXCEL_MAX_ROWS}, {_EXCEL_MAX_COLS}"
+        )
+
+    options = {'constant_memory': True, 'default_date_format': 'yyyy-mm-dd', 'remove_timezone': True}
+    with xlsxwriter.Workbook(filename, options) as workbook:
+        worksheet = workbook.add_worksheet()
+        worksheet.write_row(0, 0, index_names + columns)
+        for row, (label, *values) in enumerate(df.itertuples(name=None), start=1):
+            cells = [*label, *values] if multi_index else [label, *values]
+            for col, value in enumerate(cells):
+                if not pd.isna(value):
+                    worksheet.write(row, col, value)
\ No newline at end of file
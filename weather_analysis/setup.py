@@ -3,7 +3,7 @@ from setuptools import setup, find_packages
 Этот модуль содержит настройки для установки пакета weather_analysis.
 
 Пакет weather_analysis предназначен для анализа данных о погоде. Он включает в себя инструменты для загрузки,
-обработки и анализа метеорологических данных с использованием библиотек pandas, numpy и meteostat.
+обработки и анализа метеорологических данных с использованием библиотек pandas, numpy, numba и meteostat.
 
 Функции:
     setup() - функция настройки setuptools, которая определяет параметры установки пакета.
@@ -13,6 +13,7 @@ from setuptools import setup, find_packages
     version (str): Версия пакета.
     packages (list): Список пакетов, включенных в установку.
     install_requires (list): Список зависимостей, необходимых для работы пакета.
+    extras_require (dict): Необязательные зависимости для дополнительных возможностей.
     entry_points (dict): Определение точек входа для консольных скриптов.
 """
 setup(
@@ -22,9 +23,14 @@ setup(
     install_requires=[
         'pandas',
         'numpy',
+        'numba',
         'meteostat',
-        'openpyxl'
+        'xlsxwriter'
     ],
+    extras_require={
+        'arrow': ['pyarrow'],
+        'fast': ['bottleneck'],
+    },
     entry_points={
         'console_scripts': [
             'weather_analysis=weather_analysis.cli:main',
@@ -1,6 +1,17 @@
+import importlib.util
+import os
+import tempfile
 import unittest
+import numpy as np
 import pandas as pd
-from data_analysis.weather_analysis.data_analis.data_processing import WeatherDataProcessor
+from data_analysis.weather_analysis.data_analis.data_processing import (
+    _CHUNK,
+    _EXCEL_MAX_COLS,
+    _EXCEL_MAX_ROWS,
+    WeatherDataProcessor,
+    _rolling_mean,
+    save_to_excel,
+)
 
 class TestWeatherDataProcessor(unittest.TestCase):
     """
@@ -9,10 +20,20 @@ class TestWeatherDataProcessor(unittest.TestCase):
     Методы класса:
     - setUp: подготавливает данные для тестирования.
     - test_moving_average: тестирует вычисление скользящего среднего.
+    - test_moving_average_with_gap: тестирует скользящее среднее для ряда с пропуском.
     - test_differential: тестирует вычисление дифференциала температуры.
+    - test_rolling_extremes: тестирует вычисление скользящих максимумов и минимумов.
+    - test_rolling_extremes_with_gap: тестирует скользящие экстремумы для ряда с пропусками.
     - test_autocorrelation: тестирует вычисление автокорреляции.
+    - test_autocorrelation_generator: тестирует ограничение числа вычисляемых лагов.
     - test_find_extremes: тестирует поиск экстремумов в данных.
     - test_process_data: тестирует полную обработку данных.
+    - test_process_data_long_series: тестирует обработку ряда длиннее одного блока ядра.
+    - test_extrema_values: тестирует получение значений экстремумов по флагам.
+    - test_hash_and_equality: тестирует сравнение и хеширование обработчиков по содержимому.
+    - test_save_to_excel: тестирует сохранение DataFrame в Excel и обратное чтение.
+    - test_save_to_excel_too_large: тестирует отказ сохранять DataFrame больше листа Excel.
+    - test_use_arrow: тестирует обработку со столбцом температур в формате PyArrow.
     """    
     def setUp(self):
         """
@@ -43,6 +64,47 @@ class TestWeatherDataProcessor(unittest.TestCase):
         self.assertEqual(len(ma.dropna()), 8)
         self.assertAlmostEqual(ma.dropna().iloc[0], 1.0)
 
+    def test_moving_average_with_gap(self):
+        """
+        Тестирует скользящее среднее для ряда с пропуском (NaN).
+
+        Проверяет:
+        - Совпадение результата ядра _rolling_mean и метода moving_average с rolling(3).mean().
+        - Восстановление значений после того, как пропуск выходит из окна.
+        - Тип float64 и совпадение moving_average(7) со столбцом 'moving_average' из process_data.
+        """
+        temperature = pd.Series(
+            [1.0, 2.0, np.nan, 4.0, 5.0, 6.0, 7.0, 8.0, 9.0, 10.0, 11.0, 12.0],
+            index=pd.date_range(start='2023-01-01', periods=12, freq='D'),
+        )
+        expected = temperature.rolling(3).mean().to_numpy()
+        np.testing.assert_allclose(_rolling_mean(temperature.to_numpy(), 3), expected)
+        processor = WeatherDataProcessor(temperature.to_frame('temperature'))
+        ma = processor.moving_average(3)
+        np.testing.assert_allclose(ma.to_numpy(), expected)
+        self.assertAlmostEqual(ma.iloc[5], 5.0)
+        self.assertEqual(ma.dtype, np.float64)
+        np.testing.assert_allclose(
+            processor.moving_average(7).to_numpy(),
+            processor.process_data()['moving_average'].to_numpy(),
+        )
+
+    def test_rolling_extremes_with_gap(self):
+        """
+        Тестирует метод rolling_extremes для ряда с пропусками (NaN).
+
+        Проверяет:
+        - Совпадение результата с rolling(2).max() и rolling(2).min().
+        - ValueError для отрицательного окна.
+        """
+        temperature = pd.Series([1.0, np.nan, 3.0, 2.0, np.nan, 0.5])
+        processor = WeatherDataProcessor(temperature.to_frame('temperature'))
+        rolling_max, rolling_min = processor.rolling_extremes(2)
+        np.testing.assert_allclose(rolling_max.to_numpy(), temperature.rolling(2).max().to_numpy())
+        np.testing.assert_allclose(rolling_min.to_numpy(), temperature.rolling(2).min().to_numpy())
+        with self.assertRaises(ValueError):
+            processor.rolling_extremes(-1)
+
     def test_differential(self):
         """
         Тестирует метод differential класса WeatherDataProcessor.
@@ -50,10 +112,27 @@ class TestWeatherDataProcessor(unittest.TestCase):
         Проверяет:
         - Длину результата (должна быть на 1 меньше исходной, так как это первая разность).
         - Значение первой разности.
+        - Отсутствие погрешности float32 в разностях и скользящем среднем.
         """
         diff = self.processor.differential()
         self.assertEqual(len(diff.dropna()), 9)
         self.assertEqual(diff.iloc[1], 1)
+        processor = WeatherDataProcessor(pd.DataFrame({'temperature': [20.1, 20.3]}))
+        self.assertEqual(processor.differential().iloc[1], 20.3 - 20.1)
+        self.assertAlmostEqual(processor.moving_average(2).iloc[1], (20.1 + 20.3) / 2, places=12)
+
+    def test_rolling_extremes(self):
+        """
+        Тестирует метод rolling_extremes класса WeatherDataProcessor.
+
+        Проверяет:
+        - Длину результата (должна быть на 2 меньше исходной из-за окна в 3 элемента).
+        - Значения скользящих максимумов и минимумов.
+        """
+        rolling_max, rolling_min = self.processor.rolling_extremes(3)
+        self.assertEqual(len(rolling_max.dropna()), 8)
+        self.assertEqual(list(rolling_max.dropna()), [2, 2, 3, 4, 4, 5, 6, 7])
+        self.assertEqual(list(rolling_min.dropna()), [0, 1, 1, 1, 2, 2, 2, 5])
 
     def test_autocorrelation(self):
         """
@@ -61,9 +140,31 @@ class TestWeatherDataProcessor(unittest.TestCase):
 
         Проверяет:
         - Тип возвращаемого значения (должен быть float).
+        - NaN для лагов вне диапазона.
+        - Совпадение с autocorrelation_generator и pd.Series.autocorr.
         """
         ac = self.processor.autocorrelation(1)
         self.assertIsInstance(ac, float)
+        self.assertTrue(pd.isna(self.processor.autocorrelation(len(self.df))))
+        self.assertTrue(pd.isna(self.processor.autocorrelation(-1)))
+        acf = list(self.processor.autocorrelation_generator(max_lag=3))
+        for lag in range(4):
+            self.assertAlmostEqual(self.processor.autocorrelation(lag), acf[lag])
+            self.assertAlmostEqual(self.processor.autocorrelation(lag), self.df['temperature'].autocorr(lag))
+
+    def test_autocorrelation_generator(self):
+        """
+        Тестирует метод autocorrelation_generator класса WeatherDataProcessor.
+
+        Проверяет:
+        - Длину результата (должна совпадать с длиной исходного ряда).
+        - Значение для нулевого лага и NaN для лагов больше max_lag.
+        """
+        acf = list(self.processor.autocorrelation_generator(max_lag=3))
+        self.assertEqual(len(acf), len(self.df))
+        self.assertAlmostEqual(acf[0], 1.0)
+        self.assertFalse(any(pd.isna(acf[:4])))
+        self.assertTrue(all(pd.isna(acf[4:])))
 
     def test_find_extremes(self):
         """
@@ -94,6 +195,137 @@ class TestWeatherDataProcessor(unittest.TestCase):
         self.assertIn('maxima', processed_data.columns)
         self.assertIn('minima', processed_data.columns)
         self.assertEqual(len(processed_data['autocorrelation']), len(self.df))
+        self.assertEqual(processed_data['maxima'].dtype, 'uint8')
+        self.assertEqual(processed_data['maxima'].sum(), 2)
+        self.assertEqual(processed_data['minima'].sum(), 2)
+
+    def test_process_data_long_series(self):
+        """
+        Тестирует process_data на ряде длиннее _CHUNK, который ядро обрабатывает несколькими блоками.
+
+        Проверяет:
+        - Совпадение скользящего среднего и дифференциала с rolling(7).mean() и diff()
+          для ряда без пропусков и с пропусками, в том числе на границе блоков.
+        """
+        rng = np.random.default_rng(0)
+        n = 3 * _CHUNK + 123
+        values = rng.normal(10.0, 5.0, n)
+        gapped = values.copy()
+        gapped[[5, _CHUNK - 3, _CHUNK, 2 * _CHUNK + 4]] = np.nan
+        index = pd.date_range(start='2000-01-01', periods=n, freq='h')
+        for temperature in (values, gapped):
+            with self.subTest(has_gaps=bool(np.isnan(temperature).any())):
+                df = pd.DataFrame({'temperature': temperature}, index=index)
+                processed_data = WeatherDataProcessor(df).process_data()
+                np.testing.assert_allclose(
+                    processed_data['moving_average'].to_numpy(),
+                    df['temperature'].rolling(7).mean().to_numpy(),
+                    rtol=1e-8,
+                )
+                np.testing.assert_allclose(
+                    processed_data['differential'].to_numpy(),
+                    df['temperature'].diff().to_numpy(),
+                )
+
+    def test_extrema_values(self):
+        """
+        Тестирует метод extrema_values класса WeatherDataProcessor.
+
+        Проверяет:
+        - Совпадение значений экстремумов с результатом find_extremes.
+        """
+        maxima, minima = self.processor.extrema_values()
+        expected_maxima, expected_minima = self.processor.find_extremes()
+        self.assertEqual(list(maxima), list(expected_maxima))
+        self.assertEqual(list(minima), list(expected_minima))
+
+    def test_hash_and_equality(self):
+        """
+        Тестирует методы __eq__ и __hash__ класса WeatherDataProcessor.
+
+        Проверяет:
+        - Равенство и совпадение хешей обработчиков с одинаковыми данными.
+        - Неравенство обработчиков с разными данными, в том числе совпадающими в float32.
+        - Независимость обработчика от изменений исходного DataFrame после его создания.
+        """
+        same = WeatherDataProcessor(self.df.copy())
+        self.assertEqual(self.processor, same)
+        self.assertEqual(hash(self.processor), hash(same))
+        other = WeatherDataProcessor(self.df * 2)
+        self.assertNotEqual(self.processor, other)
+        close = WeatherDataProcessor(pd.DataFrame({'temperature': [20.1, 20.2, 20.3]}))
+        near = WeatherDataProcessor(pd.DataFrame({'temperature': [20.1, 20.2, 20.3000001]}))
+        self.assertNotEqual(close, near)
+        self.assertNotEqual(hash(close), hash(near))
+        df = self.df.astype(float)
+        snapshot = WeatherDataProcessor(df)
+        df.iloc[0, 0] = 100.0
+        self.assertEqual(snapshot, WeatherDataProcessor(self.df))
+        self.assertEqual(hash(snapshot), hash(WeatherDataProcessor(self.df)))
+        self.assertEqual(snapshot.differential().iloc[1], 1)
+
+    @unittest.skipUnless(importlib.util.find_spec('openpyxl'), 'для чтения xlsx нужен openpyxl')
+    def test_save_to_excel(self):
+        """
+        Тестирует функцию save_to_excel.
+
+        Проверяет:
+        - Совпадение прочитанного через pd.read_excel DataFrame с сохранённым, включая пропуски.
+        - Запись MultiIndex строк в отдельные столбцы и объединение уровней MultiIndex столбцов.
+        """
+        with tempfile.TemporaryDirectory() as tmp:
+            filename = os.path.join(tmp, 'weather.xlsx')
+            df = self.df.astype(float)
+            df.iloc[3, 0] = np.nan
+            save_to_excel(df, filename)
+            loaded = pd.read_excel(filename, index_col=0)
+            pd.testing.assert_frame_equal(loaded, df, check_dtype=False, check_index_type=False, check_freq=False)
+
+            index = pd.MultiIndex.from_arrays([['a', 'a', 'b'], [1, 2, 1]], names=['station', 'day'])
+            columns = pd.MultiIndex.from_tuples([('temperature', 'min'), ('temperature', 'max')])
+            df = pd.DataFrame([[1.0, 2.0], [3.0, 4.0], [5.0, 6.0]], index=index, columns=columns)
+            save_to_excel(df, filename)
+            loaded = pd.read_excel(filename, index_col=[0, 1])
+            self.assertEqual(list(loaded.columns), ['temperature_min', 'temperature_max'])
+            self.assertEqual(list(loaded.index), list(df.index))
+            self.assertEqual(list(loaded.index.names), ['station', 'day'])
+            np.testing.assert_allclose(loaded.to_numpy(), df.to_numpy())
+
+    def test_save_to_excel_too_large(self):
+        """
+        Тестирует функцию save_to_excel на DataFrame, не помещающемся на лист Excel.
+
+        Проверяет:
+        - ValueError при превышении числа строк и числа столбцов.
+        - Отсутствие частично записанного файла.
+        """
+        too_many_rows = pd.DataFrame({'temperature': np.zeros(_EXCEL_MAX_ROWS)})
+        too_many_cols = pd.DataFrame(np.zeros((1, _EXCEL_MAX_COLS)))
+        with tempfile.TemporaryDirectory() as tmp:
+            filename = os.path.join(tmp, 'weather.xlsx')
+            for df in (too_many_rows, too_many_cols):
+                with self.assertRaises(ValueError):
+                    save_to_excel(df, filename)
+                self.assertFalse(os.path.exists(filename))
+
+    @unittest.skipUnless(importlib.util.find_spec('pyarrow'), 'нужен pyarrow')
+    def test_use_arrow(self):
+        """
+        Тестирует WeatherDataProcessor с параметром use_arrow=True.
+
+        Проверяет:
+        - Совпадение differential() с вычислением без PyArrow, в том числе при пропуске.
+        - Совпадение differential() со столбцом 'differential' из process_data.
+        """
+        df = pd.DataFrame(
+            {'temperature': [20.1, 20.3, np.nan, 20.0, 19.7]},
+            index=pd.date_range(start='2023-01-01', periods=5, freq='D'),
+        )
+        arrow = WeatherDataProcessor(df, use_arrow=True)
+        diff = arrow.differential().to_numpy()
+        np.testing.assert_array_equal(diff, WeatherDataProcessor(df).differential().to_numpy())
+        np.testing.assert_array_equal(diff, arrow.process_data()['differential'].to_numpy())
+        self.assertEqual(diff[1], 20.3 - 20.1)
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file